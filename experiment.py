@@ -32,7 +32,7 @@ where minsup values are *support counts* (not percentages).
 
 CICLAD writes:
   - frequent closed itemsets to STDOUT (we redirect to a file)
-  - logs/timing to STDERR (we redirect to a log file)
+  - logs/timing to STDERR (we parse it as it streams; --keep-logs also saves it)
 We parse the log to get pattern counts per minsup count.
 
 Environment variables (optional):
@@ -46,10 +46,12 @@ Raw datasets expected in DATA_DIR (default: ./data_raw):
   kr-vs-kp:    kr-vs-kp.data
 """
 
-import os, json, random, subprocess, time, pathlib, argparse, shlex
-import math, shutil, re
+import os, json, subprocess, time, pathlib, argparse, shlex
+import math, shutil, re, hashlib, mmap
+from collections import Counter
 
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+import numpy as np
 import pandas as pd
 
 import matplotlib
@@ -58,7 +60,11 @@ import matplotlib.pyplot as plt
 
 import tempfile
 import threading
+import multiprocessing
+import multiprocessing.util
+from multiprocessing import shared_memory
 import uuid
+import atexit
 
 
 # ----------------------
@@ -94,29 +100,138 @@ def _mkfifo_pattern_path(prefix="spmf_", suffix=".fifo"):
     name = f"{prefix}{os.getpid()}_{time.time_ns()}_{uuid.uuid4().hex}{suffix}"
     return os.path.join(PATTERN_FIFO_DIR, name)
 
-def _parse_spmf_line_for_len(line: str) -> int:
-    """Return item count in a SPMF output line like: '1 2 3 #SUP: 10'."""
-    line = line.strip()
-    if not line:
-        return 0
-    left = line.split("#SUP:")[0].strip()
-    if not left:
-        return 0
-    return len(left.split())
-
-
-def _parse_spmf_line_for_sup(line: str):
-    """Parse support from a SPMF output line like: '1 2 3 #SUP: 10'. Return int or None."""
-    line = line.strip()
-    if not line:
-        return None
-    parts = line.split("#SUP:")
-    if len(parts) < 2:
-        return None
+
+# Pool of reusable FIFOs: consecutive runs share named pipes instead of paying a mkfifo/unlink
+# pair per run. A FIFO carries no data once both ends are closed, so an idle one is clean.
+_FIFO_IDLE = []
+_FIFO_ALL = {}  # path -> owning pid (forked workers must not reuse or unlink the parent's FIFOs)
+_FIFO_POOL_LOCK = threading.Lock()
+
+
+def _acquire_pattern_fifo():
+    """Take an idle FIFO owned by this process, or create a new named pipe."""
+    pid = os.getpid()
+    with _FIFO_POOL_LOCK:
+        while _FIFO_IDLE:
+            path = _FIFO_IDLE.pop()
+            if _FIFO_ALL.get(path) == pid and os.path.exists(path):
+                return path
+    path = _mkfifo_pattern_path(prefix="spmf_")
     try:
-        return int(parts[1].strip())
-    except Exception:
-        return None
+        os.mkfifo(path, 0o600)
+    except Exception as e:
+        raise RuntimeError(
+            f"Failed to create FIFO at {path}. "
+            f"Try setting PATTERN_FIFO_DIR to a writable filesystem. Error: {e}"
+        )
+    with _FIFO_POOL_LOCK:
+        _FIFO_ALL[path] = pid
+    return path
+
+
+def _release_pattern_fifo(path, reusable=True):
+    """Return a drained FIFO to the pool, or unlink it when it cannot be reused (reader still attached)."""
+    with _FIFO_POOL_LOCK:
+        if reusable:
+            _FIFO_IDLE.append(path)
+            return
+        _FIFO_ALL.pop(path, None)
+    safe_unlink(path)
+
+
+def _release_fifo_reader(path):
+    """Wake a reader blocked in open() on path (writer never connected) so it sees EOF."""
+    try:
+        os.close(os.open(path, os.O_WRONLY | os.O_NONBLOCK))
+    except OSError:
+        pass
+
+
+def _cleanup_pattern_fifos():
+    pid = os.getpid()
+    with _FIFO_POOL_LOCK:
+        paths = [p for p, owner in _FIFO_ALL.items() if owner == pid]
+        for p in paths:
+            del _FIFO_ALL[p]
+        _FIFO_IDLE.clear()
+    for p in paths:
+        safe_unlink(p)
+
+
+atexit.register(_cleanup_pattern_fifos)
+
+READ_CHUNK_BYTES = 1 << 20
+
+
+def _iter_byte_lines(f, chunk_size=READ_CHUNK_BYTES):
+    """Yield newline-split lines from a binary stream read in large chunks (no text decoding)."""
+    tail = b""
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        lines = (tail + chunk).split(b"\n")
+        tail = lines.pop()
+        yield from lines
+    if tail:
+        yield tail
+
+
+def _scan_spmf_line_py(line: bytes):
+    """Return (item_count, support) for a raw SPMF output line; support is -1 if absent/invalid."""
+    # One partition serves both fields.
+    left, sep, sup = line.partition(b"#SUP:")
+    n = len(left.split())
+    if not sep:
+        return n, -1
+    try:
+        return n, int(sup)
+    except ValueError:
+        return n, -1
+
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to the pure-Python parser
+    njit = None
+
+if njit is not None:
+    @njit(cache=True)
+    def _scan_spmf_line_jit(buf):
+        """Byte-level twin of _scan_spmf_line_py (count tokens before '#SUP:', parse the int after it)."""
+        n = len(buf)
+        count = 0
+        in_tok = False
+        i = 0
+        while i < n:
+            c = buf[i]
+            if (c == 35 and i + 4 < n and buf[i + 1] == 83 and buf[i + 2] == 85
+                    and buf[i + 3] == 80 and buf[i + 4] == 58):  # b"#SUP:"
+                j = i + 5
+                while j < n and (buf[j] == 32 or buf[j] == 9):
+                    j += 1
+                sup = 0
+                digits = 0
+                while j < n and 48 <= buf[j] <= 57:
+                    sup = sup * 10 + (buf[j] - 48)
+                    digits += 1
+                    j += 1
+                while j < n and (buf[j] == 32 or buf[j] == 9 or buf[j] == 10 or buf[j] == 13):
+                    j += 1
+                if digits == 0 or j != n:
+                    sup = -1
+                return count, sup
+            if c == 32 or c == 9 or c == 10 or c == 13:
+                in_tok = False
+            elif not in_tok:
+                count += 1
+                in_tok = True
+            i += 1
+        return count, -1
+
+    _scan_spmf_line = _scan_spmf_line_jit
+else:
+    _scan_spmf_line = _scan_spmf_line_py
 
 
 
@@ -160,6 +275,58 @@ def one_hot_row(row, drop_cols=()):
     return items
 
 
+def tokenize_frame(df, drop_cols=()):
+    """
+    Column-wise equivalent of [one_hot_row(r, drop_cols) for _, r in df.iterrows()].
+    Builds "col=value" tokens with vectorized pandas string ops instead of a
+    per-row Python loop; same '?'/empty/NaN rules as one_hot_row.
+    """
+    cols = []
+    for c in df.columns:
+        if c in drop_cols:
+            continue
+        s = df[c].astype(str).str.strip()
+        s = s.where(~s.isin(["", "nan", "None"]), other=None)
+        # masked cells stay missing after the concat and are filtered below
+        cols.append((f"{c}=" + s).tolist())
+    if not cols:
+        return [[] for _ in range(len(df))]
+    return [[tok for tok in row if isinstance(tok, str)] for row in zip(*cols)]
+
+
+# Frames with at least this many rows are tokenized in chunks across processes;
+# below it, worker start-up costs more than the tokenization itself.
+PARALLEL_TOKENIZE_MIN_ROWS = 20000
+# Worker count for tokenize_frame_parallel; None means all available CPUs.
+# Lowered inside the preprocessing pool so concurrent datasets share the CPUs.
+TOKENIZE_WORKERS = None
+
+
+def _tokenize_chunk(df_chunk, drop_cols):
+    return tokenize_frame(df_chunk, drop_cols=drop_cols)
+
+
+def tokenize_frame_parallel(df, drop_cols=(), workers=None):
+    """
+    Split df into row chunks (one per worker), tokenize them in a
+    ProcessPoolExecutor and concatenate the results in row order.
+    Falls back to tokenize_frame for small frames or a single worker.
+    """
+    workers = workers or TOKENIZE_WORKERS or available_cpus()
+    n = len(df)
+    if workers <= 1 or n < PARALLEL_TOKENIZE_MIN_ROWS:
+        return tokenize_frame(df, drop_cols=drop_cols)
+
+    step = int(math.ceil(n / workers))
+    chunks = [df.iloc[i:i + step] for i in range(0, n, step)]
+    with ProcessPoolExecutor(max_workers=len(chunks)) as ex:
+        parts = ex.map(_tokenize_chunk, chunks, [tuple(drop_cols)] * len(chunks))
+        out = []
+        for part in parts:
+            out.extend(part)
+    return out
+
+
 def _read_any_existing(paths, **pd_kwargs):
     for p in paths:
         if p and os.path.exists(p):
@@ -167,65 +334,78 @@ def _read_any_existing(paths, **pd_kwargs):
     raise FileNotFoundError(f"None of these files exist: {paths}")
 
 
+# Raw file candidates per dataset under DATA_DIR, in preference order. The loaders and
+# raw_fingerprint both resolve the file through raw_path, so they always agree on it.
+RAW_CANDIDATES = {
+    "mushroom":    ["mushroom.csv", "agaricus-lepiota.data"],
+    "connect4":    ["connect-4.data"],
+    "tic-tac-toe": ["tic-tac-toe.data"],
+    "car":         ["car.data", "car.data.csv", "car-evaluation.data", "car_evaluation.data"],
+    "kr-vs-kp":    ["kr-vs-kp.data"],
+}
+
+
+def raw_path(ds):
+    """Return the first existing raw file of ds, or None."""
+    for name in RAW_CANDIDATES.get(ds, []):
+        p = os.path.join(DATA_DIR, name)
+        if os.path.exists(p):
+            return p
+    return None
+
+
+def _require_raw_path(ds):
+    p = raw_path(ds)
+    if p is None:
+        raise FileNotFoundError(f"Cannot find {ds} dataset in {DATA_DIR}. Tried: {RAW_CANDIDATES.get(ds, [])}")
+    return p
+
+
 def load_mushroom():
     # Prefer user-provided CSV with headers, else UCI .data (no header)
-    p_csv = os.path.join(DATA_DIR, "mushroom.csv")
-    p_dat = os.path.join(DATA_DIR, "agaricus-lepiota.data")
+    p = _require_raw_path("mushroom")
 
-    if os.path.exists(p_csv):
-        df = pd.read_csv(p_csv)
+    if os.path.basename(p) == "mushroom.csv":
+        df = pd.read_csv(p)
         # include label by default: drop = []
         drop = []
     else:
-        df = pd.read_csv(p_dat, header=None)
+        df = pd.read_csv(p, header=None)
         df.columns = list(range(df.shape[1]))
         drop = []  # include class label too (col 0)
-    return [one_hot_row(r, drop_cols=drop) for _, r in df.iterrows()]
+    return tokenize_frame_parallel(df, drop_cols=drop)
 
 
 def load_connect4():
-    path = os.path.join(DATA_DIR, "connect-4.data")
+    path = _require_raw_path("connect4")
     df = pd.read_csv(path, header=None)
     df.columns = list(range(df.shape[1]))
     drop = []  # include label (last col)
-    return [one_hot_row(r, drop_cols=drop) for _, r in df.iterrows()]
+    return tokenize_frame_parallel(df, drop_cols=drop)
 
 
 def load_tictactoe():
-    path = os.path.join(DATA_DIR, "tic-tac-toe.data")
+    path = _require_raw_path("tic-tac-toe")
     df = pd.read_csv(path, header=None)
     df.columns = list(range(df.shape[1]))
     drop = []  # include label (last col)
-    return [one_hot_row(r, drop_cols=drop) for _, r in df.iterrows()]
+    return tokenize_frame_parallel(df, drop_cols=drop)
 
 
 def load_car():
-    candidates = [
-        os.path.join(DATA_DIR, "car.data"),
-        os.path.join(DATA_DIR, "car.data.csv"),
-        os.path.join(DATA_DIR, "car-evaluation.data"),
-        os.path.join(DATA_DIR, "car_evaluation.data"),
-    ]
-    p = None
-    for c in candidates:
-        if os.path.exists(c):
-            p = c
-            break
-    if p is None:
-        raise FileNotFoundError(f"Cannot find car dataset in {DATA_DIR}. Tried: {candidates}")
-
+    p = _require_raw_path("car")
     df = pd.read_csv(p, header=None)
     df.columns = list(range(df.shape[1]))
     drop = []  # include label (last col)
-    return [one_hot_row(r, drop_cols=drop) for _, r in df.iterrows()]
+    return tokenize_frame_parallel(df, drop_cols=drop)
 
 
 def load_kr_vs_kp():
-    path = os.path.join(DATA_DIR, "kr-vs-kp.data")
+    path = _require_raw_path("kr-vs-kp")
     df = pd.read_csv(path, header=None)
     df.columns = list(range(df.shape[1]))
     drop = []  # include label if present
-    return [one_hot_row(r, drop_cols=drop) for _, r in df.iterrows()]
+    return tokenize_frame_parallel(df, drop_cols=drop)
 
 
 LOADERS = {
@@ -237,68 +417,134 @@ LOADERS = {
 }
 
 
-def build_item2id_scan_order(transactions):
+def raw_fingerprint(ds):
+    """
+    Cheap fingerprint of the raw file a dataset is loaded from (mtime + size).
+    Return None if no candidate file exists.
     """
-    Build a token-to-integer mapping using a deterministic scan order.
+    raw = raw_path(ds)
+    if raw is None:
+        return None
+    key = f"{os.path.getmtime(raw)}:{os.path.getsize(raw)}"
+    return hashlib.sha1(key.encode()).hexdigest()
 
-    Input:
-      - transactions: list[list[str]] where each item is already a token string.
 
-    Scan order:
-      - Traverse transactions in order (top to bottom).
-      - Within each transaction, traverse tokens in order (left to right).
+def load_prep_meta_if_fresh(meta_path, fingerprint):
+    """Return the preprocessing meta if it was built from the same raw file, else None."""
+    if fingerprint is None or not os.path.exists(meta_path):
+        return None
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except Exception:
+        return None
+    if meta.get("raw_fingerprint") != fingerprint:
+        return None
+    return meta
 
-    Numbering rule:
-      - Assign a new integer ID the first time a token is observed.
-      - The mapping is stable for a fixed preprocessing order and can be inverted
-        via the returned id2item list.
 
-    Important:
-      - Tokens should be column-qualified (e.g., "col=value") for categorical datasets
-        so that identical symbols in different columns (e.g., 'f' in chess/kr-vs-kp)
-        are treated as distinct items.
-    """
-    item2id = {}
-    next_id = 1
-    for tx in transactions:
-        for tok in tx:
-            if tok not in item2id:
-                item2id[tok] = next_id
-                next_id += 1
-    return item2id
+def _factorize_tokens(transactions):
+    """Flatten token lists and factorize them in C. Return (row lengths, codes, uniques in first-seen order)."""
+    lengths = np.fromiter((len(tx) for tx in transactions), dtype=np.int64, count=len(transactions))
+    flat = [t for tx in transactions for t in tx]
+    codes, uniques = pd.factorize(pd.Series(flat, dtype=object), sort=False)
+    return lengths, codes, uniques
+
 
+class CSRTransactions:
+    """
+    Transactions as flat int32 item ids plus int64 row offsets (CSR layout):
+    row i is values[indptr[i]:indptr[i+1]]. Replaces list[list[str]] after
+    tokenization, which costs a Python str per token and a list per row.
+    """
 
-def write_transactions_int(transactions, out_path, item2id):
+    def __init__(self, values, indptr):
+        self.values = np.asarray(values, dtype=np.int32)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+
+    @classmethod
+    def from_lists(cls, transactions, item2id):
+        """Map token lists to ids (via pd.factorize on the flattened tokens) and pack them."""
+        lengths, codes, uniques = _factorize_tokens(transactions)
+        code2id = np.fromiter((item2id[u] for u in uniques), dtype=np.int32, count=len(uniques))
+        return cls(code2id[codes], np.concatenate(([0], np.cumsum(lengths))))
+
+    @classmethod
+    def from_token_lists(cls, transactions):
+        """
+        Assign token-to-integer ids in a deterministic scan order and pack the transactions.
+        Return (csr, item2id).
+
+        Input:
+          - transactions: list[list[str]] where each item is already a token string.
+
+        Scan order:
+          - Traverse transactions in order (top to bottom).
+          - Within each transaction, traverse tokens in order (left to right).
+
+        Numbering rule:
+          - Assign a new integer ID (starting at 1) the first time a token is observed.
+            pd.factorize(sort=False) numbers uniques in exactly this first-seen order, so one
+            factorize pass yields both: the codes are the ids minus one.
+
+        Important:
+          - Tokens should be column-qualified (e.g., "col=value") for categorical datasets
+            so that identical symbols in different columns (e.g., 'f' in chess/kr-vs-kp)
+            are treated as distinct items.
+        """
+        lengths, codes, uniques = _factorize_tokens(transactions)
+        item2id = {tok: i for i, tok in enumerate(uniques, start=1)}
+        csr = cls((codes + 1).astype(np.int32), np.concatenate(([0], np.cumsum(lengths))))
+        return csr, item2id
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def row(self, i):
+        return self.values[self.indptr[i]:self.indptr[i + 1]]
+
+    def canonical(self):
+        """Return a copy with every row sorted ascending and deduplicated (one lexsort for all rows)."""
+        rows = np.repeat(np.arange(len(self), dtype=np.int64), np.diff(self.indptr))
+        order = np.lexsort((self.values, rows))
+        ids, rows = self.values[order], rows[order]
+        keep = np.ones(len(ids), dtype=bool)
+        keep[1:] = (ids[1:] != ids[:-1]) | (rows[1:] != rows[:-1])
+        ids, rows = ids[keep], rows[keep]
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=len(self)))))
+        return CSRTransactions(ids, indptr)
+
+
+# Transaction files are written in batches of rows through a large buffer.
+WRITE_BATCH_ROWS = 16384
+WRITE_BUFFER_BYTES = 1 << 20
+
+
+def write_transactions_int(transactions, out_path, item2id=None):
     """
     Write each transaction as sorted integer IDs (ascending), one per line.
     (Sort for canonical form; numbering itself is scan-order.)
+
+    transactions: CSRTransactions, or list[list[str]] together with item2id.
     """
     out_path = pathlib.Path(out_path)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(out_path, "w", encoding="utf-8") as f:
-        for tx in transactions:
-            ids = sorted({item2id[t] for t in tx})
-            f.write(" ".join(map(str, ids)) + "\n")
-
+    if not isinstance(transactions, CSRTransactions):
+        transactions = CSRTransactions.from_lists(transactions, item2id)
+    csr = transactions.canonical()
+    indptr = csr.indptr.tolist()
 
-def scan_max_id(path):
-    max_id = 0
-    n = 0
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            n += 1
-            for tok in line.split():
-                try:
-                    v = int(tok)
-                    if v > max_id:
-                        max_id = v
-                except ValueError:
-                    pass
-    return n, max_id
+    id_strs = csr.values.astype(str).tolist()
+    batch = []
+    with open(out_path, "w", encoding="utf-8", buffering=WRITE_BUFFER_BYTES) as f:
+        for i in range(len(csr)):
+            batch.append(" ".join(id_strs[indptr[i]:indptr[i + 1]]))
+            if len(batch) >= WRITE_BATCH_ROWS:
+                f.write("\n".join(batch) + "\n")
+                batch.clear()
+        if batch:
+            f.write("\n".join(batch) + "\n")
 
 
 # ----------------------
@@ -318,7 +564,170 @@ def safe_unlink(path):
 # Tool runners
 # ----------------------
 
-def run_spmf(algorithm, input_path, output_path, minsup_percent, keep_pattern_files=False, minsup_count_filter=None):
+# ----------------------
+# Persistent SPMF JVMs (--spmf-server)
+# ----------------------
+# tools/SpmfServer.java keeps one JVM alive and runs SPMF requests read from stdin,
+# so JVM start-up/JIT warm-up is paid once per server instead of once per run.
+# Servers are pooled: a run borrows an idle one (or starts a new one) and returns it.
+SPMF_SERVER_SRC = os.path.join(PROJECT_DIR, "tools", "SpmfServer.java")
+USE_SPMF_SERVER = False
+
+_SPMF_IDLE = []
+_SPMF_ALL = []
+_SPMF_POOL_LOCK = threading.Lock()
+
+
+def _ensure_spmf_server_class():
+    """Compile SpmfServer.java next to itself if the .class is missing or stale. Return the class dir."""
+    cls_dir = os.path.dirname(SPMF_SERVER_SRC)
+    cls = os.path.join(cls_dir, "SpmfServer.class")
+    if os.path.exists(cls) and os.path.getmtime(cls) >= os.path.getmtime(SPMF_SERVER_SRC):
+        return cls_dir
+    javac = shutil.which("javac")
+    if javac is None:
+        raise RuntimeError("--spmf-server needs javac on PATH to build tools/SpmfServer.java")
+    proc = subprocess.run([javac, "-cp", SPMF_JAR, "-d", cls_dir, SPMF_SERVER_SRC],
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"Failed to compile {SPMF_SERVER_SRC}:\n{proc.stderr}")
+    return cls_dir
+
+
+def enable_spmf_server():
+    """Turn on persistent SPMF JVMs; fall back to one JVM per run if the server can't be built."""
+    global USE_SPMF_SERVER
+    try:
+        _ensure_spmf_server_class()
+        USE_SPMF_SERVER = True
+    except Exception as e:
+        print(f"[warn] persistent SPMF disabled, using one JVM per run: {e}")
+        USE_SPMF_SERVER = False
+    return USE_SPMF_SERVER
+
+
+def _spmf_server_acquire():
+    with _SPMF_POOL_LOCK:
+        while _SPMF_IDLE:
+            proc = _SPMF_IDLE.pop()
+            if proc.poll() is None:
+                return proc
+    cp = os.pathsep.join([os.path.dirname(SPMF_SERVER_SRC), SPMF_JAR])
+    proc = subprocess.Popen(shlex.split(JAVA_CMD) + ["-Djava.awt.headless=true", "-cp", cp, "SpmfServer"],
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                            text=True, encoding="utf-8", bufsize=1)
+    with _SPMF_POOL_LOCK:
+        _SPMF_ALL.append(proc)
+    return proc
+
+
+def _spmf_server_run(algorithm, input_path, output_path, minsup_arg):
+    """Run one SPMF request on a pooled JVM. Return (returncode, error_text)."""
+    proc = _spmf_server_acquire()
+    try:
+        proc.stdin.write("\t".join(["run", algorithm, str(input_path), str(output_path), minsup_arg]) + "\n")
+        proc.stdin.flush()
+        reply = proc.stdout.readline()
+    except (BrokenPipeError, OSError):
+        reply = ""
+    if proc.poll() is None:
+        with _SPMF_POOL_LOCK:
+            _SPMF_IDLE.append(proc)
+
+    status, _, detail = reply.rstrip("\n").partition("\t")
+    if status == "OK":
+        return 0, ""
+    return 1, detail or f"SPMF server exited (rc={proc.poll()})"
+
+
+@atexit.register
+def _shutdown_spmf_servers():
+    with _SPMF_POOL_LOCK:
+        procs = list(_SPMF_ALL)
+        _SPMF_ALL.clear()
+        _SPMF_IDLE.clear()
+    for proc in procs:
+        try:
+            proc.stdin.write("quit\n")
+            proc.stdin.close()
+            proc.wait(timeout=5)
+        except Exception:
+            proc.kill()
+
+
+def _open_zstd_sink(path):
+    """
+    Open a binary sink that zstd-compresses everything written to it into path.
+    Uses the zstandard module when installed, else the zstd CLI. Return (writer, close).
+    """
+    try:
+        import zstandard
+    except ImportError:
+        zstandard = None
+    if zstandard is not None:
+        writer = zstandard.ZstdCompressor(threads=-1).stream_writer(open(path, "wb"))
+        return writer, writer.close
+
+    zstd = shutil.which("zstd")
+    if zstd is None:
+        raise RuntimeError("--compress-patterns needs the 'zstandard' Python module or the zstd CLI on PATH")
+    proc = subprocess.Popen([zstd, "-q", "-f", "-T0", "-o", str(path)], stdin=subprocess.PIPE)
+
+    def _close():
+        proc.stdin.close()
+        if proc.wait() != 0:
+            raise RuntimeError(f"zstd failed writing {path} (rc={proc.returncode})")
+    return proc.stdin, _close
+
+
+class _TeeReader:
+    """Binary reader that copies every chunk it returns into sink (used to compress a FIFO as it is counted)."""
+
+    def __init__(self, f, sink):
+        self._f = f
+        self._sink = sink
+
+    def read(self, n=-1):
+        data = self._f.read(n)
+        if data:
+            self._sink.write(data)
+        return data
+
+
+# How much of a failed tool's stderr is kept for the error message.
+ERR_TAIL_BYTES = 4096
+
+
+def _count_spmf_patterns(src, minsup_count_filter=None):
+    """
+    Count SPMF pattern lines from a binary stream and track the max itemset length.
+    The minsup filter is resolved once, so the unfiltered loop carries no per-line check.
+    Return (count, max_len).
+    """
+    count, max_len = 0, 0
+    if minsup_count_filter is None:
+        for line in _iter_byte_lines(src):
+            if not line.strip():
+                continue
+            n_items, _ = _scan_spmf_line(line)
+            count += 1
+            if n_items > max_len:
+                max_len = n_items
+    else:
+        min_sup = max(0, int(minsup_count_filter))
+        for line in _iter_byte_lines(src):
+            if not line.strip():
+                continue
+            n_items, sup = _scan_spmf_line(line)
+            if sup < min_sup:
+                continue
+            count += 1
+            if n_items > max_len:
+                max_len = n_items
+    return count, max_len
+
+
+def run_spmf(algorithm, input_path, output_path, minsup_percent, keep_pattern_files=False, minsup_count_filter=None, compress_patterns=False):
     """
     Run SPMF algorithm with minsup as percent (e.g. 1.0 -> "1.0%").
     Return runtime + output stats.
@@ -333,6 +742,10 @@ def run_spmf(algorithm, input_path, output_path, minsup_percent, keep_pattern_fi
           If provided, we post-filter patterns by absolute support count (#SUP) >= minsup_count_filter.
           This is used for tx-ratio sweep mode "count" where minsup is a fixed *count* computed from N_full.
 
+    Compressed pattern files:
+      - keep_pattern_files=True and compress_patterns=True: patterns still stream through the FIFO; the
+        reader counts them and tees the raw bytes into a zstd compressor writing output_path + ".zst".
+
     Notes:
       - FIFO requires a filesystem that supports named pipes. If your filesystem does not, set PATTERN_FIFO_DIR to a writable dir.
     """
@@ -342,86 +755,75 @@ def run_spmf(algorithm, input_path, output_path, minsup_percent, keep_pattern_fi
     minsup_arg = f"{float(minsup_percent)}%"
     java_prefix = shlex.split(JAVA_CMD)
 
-    def _accept_line(line: str) -> bool:
-        if minsup_count_filter is None:
-            return True
-        sup = _parse_spmf_line_for_sup(line)
-        if sup is None:
-            return False
-        return sup >= int(minsup_count_filter)
-
-    # If user wants to keep patterns, use normal file output.
-    if keep_pattern_files:
-        cmd = java_prefix + ["-Djava.awt.headless=true", "-jar", SPMF_JAR, "run", algorithm, input_path, output_path, minsup_arg]
-
+    def _exec(out_path):
+        """Run SPMF (fresh JVM, or a persistent one with --spmf-server). Return (elapsed, rc, stderr, cmd)."""
+        cmd = java_prefix + ["-Djava.awt.headless=true", "-jar", SPMF_JAR, "run", algorithm, input_path, out_path, minsup_arg]
         t0 = time.perf_counter()
-        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        elapsed = time.perf_counter() - t0
+        if USE_SPMF_SERVER:
+            rc, err = _spmf_server_run(algorithm, input_path, out_path, minsup_arg)
+            cmd = cmd + ["(persistent JVM)"]
+        else:
+            # SPMF's stdout is only a progress report: discard it, and decode stderr only on failure.
+            proc = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            rc = proc.returncode
+            err = "" if rc == 0 else proc.stderr[-ERR_TAIL_BYTES:].decode(errors="replace")
+        return time.perf_counter() - t0, rc, err, cmd
 
-        if proc.returncode != 0:
-            raise RuntimeError(f"SPMF {algorithm} failed (JAVA_CMD={JAVA_CMD}):\n{proc.stderr}")
+    # If user wants to keep patterns uncompressed, use normal file output.
+    if keep_pattern_files and not compress_patterns:
+        elapsed, rc, err, cmd = _exec(output_path)
+
+        if rc != 0:
+            raise RuntimeError(f"SPMF {algorithm} failed (JAVA_CMD={JAVA_CMD}):\n{err}")
 
         count, max_len = 0, 0
         if os.path.exists(output_path):
-            with open(output_path, "r", encoding="utf-8", errors="ignore") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    if not _accept_line(line):
-                        continue
-                    count += 1
-                    max_len = max(max_len, _parse_spmf_line_for_len(line))
+            with open(output_path, "rb", buffering=READ_CHUNK_BYTES) as f:
+                count, max_len = _count_spmf_patterns(f, minsup_count_filter)
         return {"runtime_sec": elapsed, "pattern_count": count, "max_itemset_len": max_len, "cmd": " ".join(cmd)}
 
     # Default: FIFO streaming (no large disk output)
-    fifo_path = _mkfifo_pattern_path(prefix=f"spmf_{algorithm}_")
-    try:
-        if os.path.exists(fifo_path):
-            safe_unlink(fifo_path)
-        os.mkfifo(fifo_path, 0o600)
-    except Exception as e:
-        raise RuntimeError(
-            f"Failed to create FIFO at {fifo_path}. "
-            f"Try setting PATTERN_FIFO_DIR to a writable filesystem. Error: {e}"
-        )
+    fifo_path = _acquire_pattern_fifo()
 
     stats = {"count": 0, "max_len": 0}
     read_err = {"err": None}
 
+    sink, close_sink = (None, None)
+    if keep_pattern_files:
+        sink, close_sink = _open_zstd_sink(f"{output_path}.zst")
+
     def _reader():
         try:
-            with open(fifo_path, "r", encoding="utf-8", errors="ignore") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    if not _accept_line(line):
-                        continue
-                    stats["count"] += 1
-                    stats["max_len"] = max(stats["max_len"], _parse_spmf_line_for_len(line))
+            with open(fifo_path, "rb", buffering=READ_CHUNK_BYTES) as f:
+                src = f if sink is None else _TeeReader(f, sink)
+                stats["count"], stats["max_len"] = _count_spmf_patterns(src, minsup_count_filter)
         except Exception as e:
             read_err["err"] = e
+        finally:
+            if close_sink is not None:
+                try:
+                    close_sink()
+                except Exception as e:
+                    read_err["err"] = read_err["err"] or e
 
     th = threading.Thread(target=_reader, daemon=True)
     th.start()
 
-    cmd = java_prefix + ["-Djava.awt.headless=true", "-jar", SPMF_JAR, "run", algorithm, input_path, fifo_path, minsup_arg]
-
-    t0 = time.perf_counter()
-    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-    elapsed = time.perf_counter() - t0
+    elapsed, rc, err, cmd = _exec(fifo_path)
 
     # Wait for reader to finish draining FIFO after writer closes
+    if rc != 0:
+        _release_fifo_reader(fifo_path)  # SPMF may have failed before opening its output
     th.join(timeout=120.0)
 
-    safe_unlink(fifo_path)
+    # Never hand a FIFO with a live reader to the next run.
+    _release_pattern_fifo(fifo_path, reusable=not th.is_alive())
 
     if read_err["err"] is not None:
         raise RuntimeError(f"SPMF FIFO reader failed: {read_err['err']}")
 
-    if proc.returncode != 0:
-        raise RuntimeError(f"SPMF {algorithm} failed (JAVA_CMD={JAVA_CMD}):\n{proc.stderr}")
+    if rc != 0:
+        raise RuntimeError(f"SPMF {algorithm} failed (JAVA_CMD={JAVA_CMD}):\n{err}")
 
     return {"runtime_sec": elapsed, "pattern_count": stats["count"], "max_itemset_len": stats["max_len"], "cmd": " ".join(cmd)}
 
@@ -448,11 +850,9 @@ def run_hamm(input_path, output_path, minsup_percent, keep_pattern_files=False):
         count = 0
         max_len = 0
         if os.path.exists(output_path):
-            with open(output_path, "r") as f:
-                for line in f:
-                    if line.strip():
-                        count += 1
-                        max_len = max(max_len, len(line.split("#SUP:")[0].split()))
+            # Same byte-level scan as the SPMF readers: no str decoding or per-line split lists.
+            with open(output_path, "rb", buffering=READ_CHUNK_BYTES) as f:
+                count, max_len = _count_spmf_patterns(f)
             
             if not keep_pattern_files:
                 safe_unlink(output_path)
@@ -466,6 +866,14 @@ def run_hamm(input_path, output_path, minsup_percent, keep_pattern_files=False):
     except Exception as e:
         raise RuntimeError(f"Hamm execution error: {e}")
 
+# One alternation for the three CICLAD log lines we care about, so each line is scanned once.
+_RE_CICLAD = re.compile(
+    r"^minsup_counts:\s*(?P<mslist>.+)$"
+    r"|processed transactions in\s*(?P<tmval>[0-9.]+)\s*ms"
+    r"|dumped frequent closed itemsets:\s*(?P<dpval>\d+)"
+)
+
+
 def parse_ciclad_log(log_path):
     """
     Parse CICLAD stderr log.
@@ -476,31 +884,33 @@ def parse_ciclad_log(log_path):
       Minsup: 82
       processed transactions in 96543.2660 ms
     """
+    with open(log_path, "r", encoding="utf-8", errors="replace") as f:
+        return parse_ciclad_lines(f)
+
+
+def parse_ciclad_lines(lines):
+    """
+    Parse CICLAD stderr lines from any iterable of str (log file or live pipe).
+    Returns the same dict as parse_ciclad_log.
+    """
     minsups = []
     dumped = []
     times_ms = []
 
-    with open(log_path, "r", encoding="utf-8", errors="replace") as f:
-        for raw in f:
-            line = raw.strip()
-
-            m = re.match(r"^minsup_counts:\s*(.+)$", line)
-            if m:
-                minsups = [int(x) for x in m.group(1).split(",") if x.strip()]
-                continue
-
-            m = re.search(r"processed transactions in\s*([0-9.]+)\s*ms", line)
-            if m:
-                try:
-                    times_ms.append(float(m.group(1)))
-                except Exception:
-                    pass
-                continue
+    for raw in lines:
+        m = _RE_CICLAD.search(raw.strip())
+        if m is None:
+            continue
 
-            m = re.search(r"dumped frequent closed itemsets:\s*(\d+)", line)
-            if m:
-                dumped.append(int(m.group(1)))
-                continue
+        if m.group("mslist") is not None:
+            minsups = [int(x) for x in m.group("mslist").split(",") if x.strip()]
+        elif m.group("tmval") is not None:
+            try:
+                times_ms.append(float(m.group("tmval")))
+            except Exception:
+                pass
+        else:
+            dumped.append(int(m.group("dpval")))
 
     dumped_by = {}
     if minsups:
@@ -520,11 +930,12 @@ def parse_ciclad_log(log_path):
     }
 
 
-def run_ciclad_multi(input_dat, fci_out_path, log_path, nbr_items, window_size, minsup_counts, keep_pattern_files=False):
+def run_ciclad_multi(input_dat, fci_out_path, log_path, nbr_items, window_size, minsup_counts, keep_pattern_files=False, keep_log=False):
     """
     Run CICLAD once with multiple minsup counts.
     - If keep_pattern_files=True, writes frequent closed itemsets to fci_out_path (STDOUT).
-    - Always writes log to log_path (STDERR) and parses it to get counts.
+    - STDERR is piped and parsed line by line while CICLAD runs; it is only
+      also written to log_path when keep_log=True.
     - Returns parsed log + wall-clock runtime.
 
     When keep_pattern_files=False (default), STDOUT is discarded (sent to /dev/null) to save disk space.
@@ -534,14 +945,27 @@ def run_ciclad_multi(input_dat, fci_out_path, log_path, nbr_items, window_size,
 
     cmd = [CICLAD_BIN, str(input_dat), str(int(nbr_items)), str(int(window_size))] + [str(int(x)) for x in minsup_counts]
 
+    def _tee(lines, f_log):
+        for line in lines:
+            if f_log is not None:
+                f_log.write(line)
+            yield line
+
     t0 = time.perf_counter()
-    with open(log_path, "w", encoding="utf-8") as f_log:
-        if keep_pattern_files:
-            with open(fci_out_path, "w", encoding="utf-8") as f_out:
-                proc = subprocess.run(cmd, stdout=f_out, stderr=f_log, text=True)
-        else:
-            # Avoid writing huge FCI outputs to disk; we only need STDERR log for counts.
-            proc = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=f_log, text=True)
+    # Avoid writing huge FCI outputs to disk unless asked; we only need STDERR for counts.
+    f_out = open(fci_out_path, "w", encoding="utf-8") if keep_pattern_files else None
+    f_log = open(log_path, "w", encoding="utf-8") if keep_log else None
+    try:
+        proc = subprocess.Popen(cmd, stdout=(f_out if f_out is not None else subprocess.DEVNULL),
+                                stderr=subprocess.PIPE, text=True, encoding="utf-8", errors="replace")
+        with proc.stderr:
+            parsed = parse_ciclad_lines(_tee(proc.stderr, f_log))
+        proc.wait()
+    finally:
+        if f_out is not None:
+            f_out.close()
+        if f_log is not None:
+            f_log.close()
     elapsed = time.perf_counter() - t0
 
     if proc.returncode != 0:
@@ -549,7 +973,6 @@ def run_ciclad_multi(input_dat, fci_out_path, log_path, nbr_items, window_size,
             safe_unlink(fci_out_path)
         raise RuntimeError(f"CICLAD failed (rc={proc.returncode}). CMD: {' '.join(cmd)}")
 
-    parsed = parse_ciclad_log(log_path)
     parsed["runtime_sec_wall"] = elapsed
     parsed["cmd"] = " ".join(cmd)
 
@@ -558,30 +981,184 @@ def run_ciclad_multi(input_dat, fci_out_path, log_path, nbr_items, window_size,
 
     return parsed
 
+# Per-file line index shared by all tx-ratio points of a dataset:
+# (path, mtime_ns, size) -> (starts, ends) byte offsets of the non-empty lines.
+_LINE_INDEX_CACHE = {}
+_LINE_INDEX_LOCK = threading.Lock()
+
+
+# Line indexes published by the parent process: (path, mtime_ns, size) -> (shm name, n_lines).
+# Sweep workers attach to these read-only instead of rescanning the full .spmf file.
+_SHARED_LINE_INDEX = {}
+_SHARED_LINE_INDEX_SHM = []  # keeps attached segments mapped
+_SHARED_LINE_INDEX_OWNED = []  # (creator pid, SharedMemory) created by share_line_index
+
+
+def _line_index_key(path):
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+def share_line_index(paths):
+    """
+    Build the line index of each path in this process and copy it into a
+    SharedMemory segment laid out as int64[2, n] (starts, ends).
+    Return the {key: (shm name, n)} table to hand to workers; segments are
+    unlinked when this process exits.
+    """
+    table = {}
+    for path in paths:
+        starts, ends = line_index(path)
+        n = len(starts)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, 2 * n * 8))
+        arr = np.ndarray((2, n), dtype=np.int64, buffer=shm.buf)
+        arr[0], arr[1] = starts, ends
+        arr.flags.writeable = False
+        _SHARED_LINE_INDEX_OWNED.append((os.getpid(), shm))
+        key = _line_index_key(path)
+        table[key] = (shm.name, n)
+        # Serve this process (and anything it forks) from the shared copy, dropping the private one.
+        with _LINE_INDEX_LOCK:
+            _LINE_INDEX_CACHE[key] = (arr[0], arr[1])
+    return table
+
+
+def _attach_shared_line_index(key):
+    entry = _SHARED_LINE_INDEX.get(key)
+    if entry is None:
+        return None
+    name, n = entry
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return None
+    _SHARED_LINE_INDEX_SHM.append(shm)
+    arr = np.ndarray((2, n), dtype=np.int64, buffer=shm.buf)
+    arr.flags.writeable = False
+    return arr[0], arr[1]
+
+
+@atexit.register
+def _unlink_shared_line_index():
+    pid = os.getpid()
+    for owner, shm in _SHARED_LINE_INDEX_OWNED:
+        if owner != pid:
+            continue  # inherited by a forked child; the creator unlinks it
+        try:
+            shm.unlink()  # the mapping itself goes away with the process
+        except Exception:
+            pass
+    _SHARED_LINE_INDEX_OWNED.clear()
+
+
+def line_index(path):
+    """
+    Return (starts, ends) int64 arrays with the byte range of every non-empty line
+    in path (ends exclude the newline). Built once per file version with a single
+    memchr-style scan of the memory-mapped file, then memoized. Indexes shared by
+    the parent via share_line_index are attached instead of rebuilt.
+    """
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    with _LINE_INDEX_LOCK:
+        cached = _LINE_INDEX_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    shared = _attach_shared_line_index(key)
+    if shared is not None:
+        with _LINE_INDEX_LOCK:
+            _LINE_INDEX_CACHE[key] = shared
+        return shared
+
+    if st.st_size == 0:
+        starts = ends = np.zeros(0, dtype=np.int64)
+    else:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            buf = np.frombuffer(mm, dtype=np.uint8)
+            nl = np.flatnonzero(buf == ord("\n")).astype(np.int64)
+            del buf  # release the export before the mmap is closed
+        starts = np.concatenate(([0], nl + 1))
+        ends = np.concatenate((nl, [st.st_size]))
+        nonempty = ends > starts
+        starts, ends = starts[nonempty], ends[nonempty]
+
+    with _LINE_INDEX_LOCK:
+        _LINE_INDEX_CACHE[key] = (starts, ends)
+    return starts, ends
+
+
+def subsample_to_path(input_path, starts, ends, sel, output_path):
+    """
+    Write the selected lines (byte ranges from line_index) of input_path to output_path.
+    Lines are copied as raw newline-inclusive slices of the mapped file; runs of adjacent
+    selected lines are merged into a single write.
+    """
+    out_path = pathlib.Path(output_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(input_path, "rb") as fin, open(out_path, "wb", buffering=WRITE_BUFFER_BYTES) as fout:
+        if len(sel) == 0:
+            return
+        size = os.fstat(fin.fileno()).st_size
+        lo = starts[sel]
+        hi = np.minimum(ends[sel] + 1, size)  # include the trailing newline
+        # Split points where the next selected line does not start right after the previous one.
+        brk = np.flatnonzero(lo[1:] != hi[:-1]) + 1
+        run_lo = lo[np.concatenate(([0], brk))].tolist()
+        run_hi = hi[np.concatenate((brk - 1, [len(hi) - 1]))].tolist()
+        with mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                for s, e in zip(run_lo, run_hi):
+                    fout.write(view[s:e])
+            finally:
+                view.release()
+            if run_hi[-1] == size and mm[size - 1:size] != b"\n":
+                fout.write(b"\n")  # last line of the input had no newline
+
+
 def subsample_lines(input_path, output_path, ratio_percent, seed=42):
     """
     Randomly subsample transactions (without replacement) to ratio_percent.
     Works for .spmf or .dat (same line format).
     Returns number of lines written.
     """
-    with open(input_path, "r", encoding="utf-8") as f:
-        lines = [ln.rstrip("\n") for ln in f if ln.strip()]
+    starts, ends = line_index(input_path)
 
-    n = len(lines)
-    k = max(1, int(round(n * (ratio_percent / 100.0))))
-    rng = random.Random(seed + int(ratio_percent))
-    idx = list(range(n))
-    rng.shuffle(idx)
-    sel = sorted(idx[:k])
+    n = len(starts)
+    k = min(n, max(1, int(round(n * (ratio_percent / 100.0)))))
+    rng = np.random.default_rng(seed + int(ratio_percent))
+    sel = np.sort(rng.choice(n, size=k, replace=False))
 
-    out_path = pathlib.Path(output_path)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
+    subsample_to_path(input_path, starts, ends, sel, output_path)
+    return k
 
-    with open(out_path, "w", encoding="utf-8") as f:
-        for i in sel:
-            f.write(lines[i] + "\n")
 
-    return k
+def subsample_cached(input_path, output_path, ratio_percent, seed=42):
+    """
+    subsample_lines memoized on (input file version, ratio, seed).
+    The key and line count are kept in output_path + ".key"; an existing subsample is
+    reused only when its key matches, so a re-preprocessed input is never served stale.
+    Returns number of lines in output_path.
+    """
+    st = os.stat(input_path)
+    key = hashlib.blake2b(
+        f"{os.path.abspath(input_path)}:{st.st_mtime_ns}:{st.st_size}:{float(ratio_percent)}:{seed}".encode(),
+        digest_size=8,
+    ).hexdigest()
+    key_path = f"{output_path}.key"
+    try:
+        with open(key_path, "r", encoding="utf-8") as f:
+            stored_key, stored_n = f.read().split()
+        if stored_key == key and os.path.exists(output_path):
+            return int(stored_n)
+    except (OSError, ValueError):
+        pass
+
+    n = subsample_lines(input_path, output_path, ratio_percent, seed=seed)
+    with open(key_path, "w", encoding="utf-8") as f:
+        f.write(f"{key} {n}\n")
+    return n
 
 
 def plot_multi(x, ydict, title, xlabel, ylabel, out_png):
@@ -596,6 +1173,19 @@ def plot_multi(x, ydict, title, xlabel, ylabel, out_png):
     plt.savefig(out_png); plt.close()
 
 
+# Long sweeps still checkpoint metrics for --resume at least this often (seconds).
+METRICS_FLUSH_SEC = 30.0
+
+
+def save_metrics(ds_dir, ds_name, metrics):
+    """Write metrics_<ds>.json atomically (temp file + os.replace), so readers never see a partial file."""
+    p = os.path.join(ds_dir, f"metrics_{ds_name}.json")
+    tmp = f"{p}.tmp{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(metrics, f, indent=2)
+    os.replace(tmp, p)
+
+
 def load_metrics_if_any(ds_dir, ds_name):
     p = os.path.join(ds_dir, f"metrics_{ds_name}.json")
     if os.path.exists(p):
@@ -608,51 +1198,43 @@ def load_metrics_if_any(ds_dir, ds_name):
 
 
 
-def find_cached(point_list, **kv):
+def txratio_key(rec):
     """
-    Flexible matcher for legacy + new records.
-
-    Legacy records may not have:
-      - tx_sweep_minsup_mode (default: "percent")
-      - minsup_count_threshold
-
-    For minsup_count_threshold matching:
-      - if record lacks minsup_count_threshold, try record["minsup_count"] (legacy CICLAD)
-      - if still missing and requested/record mode is "percent", ignore threshold mismatch (treat as match)
+    Canonical key of a by_txratio record:
+      (alg, tx_ratio, tx_sweep_minsup_mode, minsup_percent, minsup_count_threshold_or_None)
+    Legacy records default to mode "percent" and fall back to minsup_count for the threshold.
     """
-    req_mode = kv.get("tx_sweep_minsup_mode", None)
-    req_mode = (str(req_mode).lower() if req_mode is not None else None)
+    mct = rec.get("minsup_count_threshold", None)
+    if mct is None:
+        mct = rec.get("minsup_count", None)
+    return (rec.get("algorithm"),
+            float(rec.get("transaction_ratio_percent")),
+            str(rec.get("tx_sweep_minsup_mode", "percent")).lower(),
+            float(rec.get("minsup_percent")),
+            int(mct) if mct is not None else None)
 
-    for rec in point_list:
-        ok = True
-        rec_mode = str(rec.get("tx_sweep_minsup_mode", "percent")).lower()
 
-        for k, v in kv.items():
-            if k == "tx_sweep_minsup_mode":
-                if str(rec_mode) != str(req_mode):
-                    ok = False
-                    break
-                continue
-
-            if k == "minsup_count_threshold":
-                rec_v = rec.get("minsup_count_threshold", None)
-                if rec_v is None and rec.get("minsup_count", None) is not None:
-                    rec_v = rec.get("minsup_count")
-                mode_eff = req_mode or rec_mode
-                if rec_v is None and v is not None and mode_eff == "percent":
-                    continue
-                if str(rec_v) != str(v):
-                    ok = False
-                    break
-                continue
+def txratio_cached(cache_tx, key):
+    """
+    Look up a by_txratio record by txratio_key in the resume cache.
+    Legacy matching rule: in "percent" mode a stored record without a threshold matches any threshold.
+    """
+    rec = cache_tx.get(key)
+    if rec is None and key[2] == "percent":
+        rec = cache_tx.get(key[:4] + (None,))
+    return rec
 
-            if str(rec.get(k)) != str(v):
-                ok = False
-                break
 
-        if ok:
-            return rec
-    return None
+def txratio_cache_slices(cache_tx):
+    """
+    Group a by_txratio resume cache by point: (tx_ratio, minsup_percent) -> {key: rec}.
+    Handles both the legacy (alg, txr, msp) and the (alg, txr, mode, msp, mct) keys.
+    """
+    slices = {}
+    for k, rec in cache_tx.items():
+        msp = k[2] if len(k) == 3 else k[3]
+        slices.setdefault((k[1], msp), {})[k] = rec
+    return slices
 
 
 def build_resume_cache(metrics):
@@ -671,25 +1253,17 @@ def build_resume_cache(metrics):
 
     for rec in metrics.get("by_txratio", []):
         try:
-            alg = rec.get("algorithm")
-            txr = float(rec.get("transaction_ratio_percent"))
-            msp = float(rec.get("minsup_percent"))
+            key = txratio_key(rec)
+            alg, txr, mode, msp, mct = key
 
             cache_tx[(alg, txr, msp)] = rec  # legacy
 
-            mode = str(rec.get("tx_sweep_minsup_mode", "percent")).lower()
-
-            mct = rec.get("minsup_count_threshold", None)
-            if mct is None:
-                if rec.get("minsup_count", None) is not None:
-                    mct = rec.get("minsup_count")
-                elif rec.get("n_transactions_sub", None) is not None:
-                    try:
-                        n_sub = int(rec.get("n_transactions_sub"))
-                        mct = int(math.ceil(msp / 100.0 * n_sub))
-                    except Exception:
-                        mct = None
-            mct = int(mct) if mct is not None else None
+            if mct is None and rec.get("n_transactions_sub", None) is not None:
+                try:
+                    n_sub = int(rec.get("n_transactions_sub"))
+                    mct = int(math.ceil(msp / 100.0 * n_sub))
+                except Exception:
+                    mct = None
 
             cache_tx[(alg, txr, mode, msp, mct)] = rec
             if mct is None:
@@ -711,7 +1285,137 @@ def build_resume_cache(metrics):
     return cache_tx, cache_ms
 
 
-def worker_txratio_point(ds, r, spmf_path, nbr_items, n_tx_full, ms_default, tx_sweep_minsup_mode, baselines, ds_dir, resume, cache_tx, keep_pattern_files):
+def available_cpus():
+    """CPUs this process may run on (respects affinity/cpusets where supported)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 4
+
+
+# Caps how many tool subprocesses (SPMF/Hamm/CICLAD) run at once across all workers.
+# main() replaces it with a multiprocessing semaphore shared by the sweep worker processes.
+_SUBPROC_SLOTS = threading.BoundedSemaphore(max(1, available_cpus()//2))
+
+
+def set_subprocess_slots(n):
+    global _SUBPROC_SLOTS
+    _SUBPROC_SLOTS = multiprocessing.BoundedSemaphore(max(1, int(n)))
+    return _SUBPROC_SLOTS
+
+
+def prep_paths(ds):
+    """Return (spmf_path, dat_path, item2id_path, meta_path) of a preprocessed dataset."""
+    return (os.path.join(RESULTS_DIR, f"{ds}_transactions.spmf"),
+            os.path.join(RESULTS_DIR, f"{ds}_transactions.dat"),
+            os.path.join(RESULTS_DIR, f"{ds}_item2id.json"),
+            os.path.join(RESULTS_DIR, f"{ds}_meta.json"))
+
+
+def _init_preprocess_worker(tokenize_workers):
+    """ProcessPoolExecutor initializer: split the CPU budget between concurrently preprocessed datasets."""
+    global TOKENIZE_WORKERS
+    TOKENIZE_WORKERS = tokenize_workers
+
+
+def preprocess_one(ds, force=False):
+    """
+    Build <ds>_transactions.spmf/.dat, <ds>_item2id.json and <ds>_meta.json for one dataset
+    (skipped when the raw data fingerprint matches the existing meta). Return the meta dict.
+    """
+    print(f"[preprocess] {ds}", flush=True)
+    spmf_path, dat_path, item2id_path, meta_path = prep_paths(ds)
+
+    fingerprint = raw_fingerprint(ds)
+    have_files = os.path.exists(spmf_path) and os.path.exists(dat_path) and os.path.exists(item2id_path)
+    if have_files and not force and fingerprint is None:
+        # No raw file to compare against (or to load from): keep the existing outputs.
+        print(f"[preprocess] {ds}: raw data not found, reusing {os.path.basename(spmf_path)}", flush=True)
+        return load_prep_meta_from_outputs(ds, spmf_path, item2id_path, meta_path)
+    cached_meta = None if force or not have_files else load_prep_meta_if_fresh(meta_path, fingerprint)
+    if cached_meta is not None:
+        print(f"[preprocess] {ds}: raw data unchanged, reusing {os.path.basename(spmf_path)}", flush=True)
+        return cached_meta
+
+    txs = LOADERS[ds]()
+    csr, item2id = CSRTransactions.from_token_lists(txs)
+    del txs  # token lists are no longer needed once packed
+    write_transactions_int(csr, spmf_path)
+    shutil.copyfile(spmf_path, dat_path)  # CICLAD input is identical
+
+    with open(item2id_path, "w", encoding="utf-8") as f:
+        json.dump(item2id, f, indent=2)
+
+    meta = prep_meta(ds, len(csr), max(item2id.values()) if item2id else 0, fingerprint)
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+def prep_meta(ds, n_tx, max_id, fingerprint):
+    """The <ds>_meta.json record of a preprocessed dataset."""
+    return {
+        "dataset": ds,
+        "n_transactions": n_tx,
+        "max_item_id": max_id,
+        "nbr_items_for_ciclad": max_id + 1,
+        "format": "one transaction per line; space-separated positive ints; 1-based ids",
+        "id_assignment": "first-seen scan order over rows then columns (token=col=value)",
+        "label_included": True,
+        "raw_fingerprint": fingerprint,
+    }
+
+
+def load_prep_meta_from_outputs(ds, spmf_path, item2id_path, meta_path):
+    """
+    Meta of an already preprocessed dataset whose raw file is unavailable: the stored
+    meta if readable, else rebuilt from the transaction file and item2id.json.
+    """
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+    with open(item2id_path, "r", encoding="utf-8") as f:
+        item2id = json.load(f)
+    starts, _ = line_index(spmf_path)
+    return prep_meta(ds, len(starts), max(item2id.values()) if item2id else 0, None)
+
+
+def worker_cpu_set(worker_idx, n_workers, cpus=None):
+    """
+    Disjoint slice of the available CPUs for sweep worker worker_idx (0-based) out of n_workers.
+    Workers beyond the CPU count wrap around and share cores.
+    """
+    cpus = sorted(cpus if cpus is not None else os.sched_getaffinity(0))
+    per = max(1, len(cpus) // max(1, n_workers))
+    start = (worker_idx * per) % len(cpus)
+    return set(cpus[start:start + per])
+
+
+def _init_sweep_worker(slots, use_spmf_server, shared_line_index=None, pin_cpus=None):
+    """
+    ProcessPoolExecutor initializer: share the subprocess slots, runner settings and line indexes with workers.
+    pin_cpus=(n_workers, cpus) binds this worker to its own CPU slice; the SPMF/Hamm/CICLAD subprocesses
+    it starts inherit the affinity, so concurrent tools do not migrate across each other's cores.
+    """
+    global _SUBPROC_SLOTS, USE_SPMF_SERVER
+    _SUBPROC_SLOTS = slots
+    USE_SPMF_SERVER = use_spmf_server
+    _SHARED_LINE_INDEX.update(shared_line_index or {})
+    if pin_cpus is not None:
+        n_workers, cpus = pin_cpus
+        identity = multiprocessing.current_process()._identity
+        worker_idx = (identity[-1] - 1) % n_workers if identity else 0
+        try:
+            os.sched_setaffinity(0, worker_cpu_set(worker_idx, n_workers, cpus))
+        except (AttributeError, OSError):
+            pass  # affinity is Linux-only; run unpinned elsewhere
+    # Pool workers leave through multiprocessing's exit path, which skips atexit handlers.
+    multiprocessing.util.Finalize(None, _cleanup_pattern_fifos, exitpriority=0)
+
+
+def worker_txratio_point(ds, r, spmf_path, nbr_items, n_tx_full, ms_default, tx_sweep_minsup_mode, baselines, ds_dir, resume, cache_tx, keep_pattern_files, keep_logs=False, compress_patterns=False, concurrent_baselines=False):
     """
     Run selected baselines for one (dataset, tx_ratio) point.
 
@@ -720,6 +1424,9 @@ def worker_txratio_point(ds, r, spmf_path, nbr_items, n_tx_full, ms_default, tx_
       - "count"  : fixed minsup COUNT computed from full dataset size (100% tx * minsup ratio).
                   For SPMF, we pass an effective percent and post-filter patterns by support >= fixed_count.
 
+    concurrent_baselines: run this point's tools side by side instead of one after another.
+      Faster, but their runtimes then compete for cores and memory bandwidth.
+
     Returns: (ds, r, recs[list-of-dicts])
     """
     r = float(r)
@@ -728,10 +1435,7 @@ def worker_txratio_point(ds, r, spmf_path, nbr_items, n_tx_full, ms_default, tx_
         mode = "percent"
 
     sub_path = os.path.join(ds_dir, f"sub_{int(r)}.spmf")
-    if not os.path.exists(sub_path):
-        n_sub = subsample_lines(spmf_path, sub_path, r, seed=RANDOM_SEED)
-    else:
-        n_sub, _ = scan_max_id(sub_path)
+    n_sub = subsample_cached(spmf_path, sub_path, r, seed=RANDOM_SEED)
 
     n_sub = int(n_sub)
     n_tx_full = int(n_tx_full)
@@ -768,18 +1472,52 @@ def worker_txratio_point(ds, r, spmf_path, nbr_items, n_tx_full, ms_default, tx_
                 return cache_tx[k_old]
         return None
 
-    for alg in [a for a in baselines if a in {"FPGrowth_itemsets", "Eclat", "Hamm"}]:
-        cached = _cache_lookup(alg)
+    point_algs = [a for a in baselines if a in {"FPGrowth_itemsets", "Eclat", "Hamm"}]
+    if "CICLAD" in baselines:
+        point_algs.append("CICLAD")
+    cached_by_alg = {alg: _cache_lookup(alg) for alg in point_algs}
+
+    fci_file = os.path.join(ds_dir, f"CICLAD_tx{int(r)}_fci.txt")
+    log_file = os.path.join(ds_dir, f"CICLAD_tx{int(r)}.log")
+
+    def _run(alg):
+        # Bounded by the process-wide slot count so nested pools don't oversubscribe.
+        with _SUBPROC_SLOTS:
+            if alg == "Hamm":
+                return run_hamm(sub_path, os.path.join(ds_dir, f"{alg}_tx{int(r)}.txt"), effective_minsup_percent, keep_pattern_files)
+            if alg == "CICLAD":
+                return run_ciclad_multi(
+                    input_dat=sub_path,
+                    fci_out_path=fci_file,
+                    log_path=log_file,
+                    nbr_items=nbr_items,
+                    window_size=n_sub,
+                    minsup_counts=[int(minsup_count_threshold)],
+                    keep_pattern_files=keep_pattern_files,
+                    keep_log=keep_logs,
+                )
+            return run_spmf(alg, sub_path, os.path.join(ds_dir, f"{alg}_tx{int(r)}.txt"), effective_minsup_percent, keep_pattern_files, spmf_filter_count, compress_patterns)
+
+    runs = {}
+    to_run = [alg for alg in point_algs if cached_by_alg[alg] is None]
+    if to_run and concurrent_baselines:
+        # The tools for one point are independent subprocesses; run them side by side.
+        with ThreadPoolExecutor(max_workers=len(to_run)) as ex:
+            futs = {ex.submit(_run, alg): alg for alg in to_run}
+            for fut in as_completed(futs):
+                runs[futs[fut]] = fut.result()
+    else:
+        # Default: one tool at a time, so the runtimes being compared don't skew each other.
+        for alg in to_run:
+            runs[alg] = _run(alg)
+
+    for alg in [a for a in point_algs if a != "CICLAD"]:
+        cached = cached_by_alg[alg]
         if cached is not None:
             recs.append(cached)
             continue
 
-        out_file = os.path.join(ds_dir, f"{alg}_tx{int(r)}.txt")
-        if alg == "Hamm":
-            m = run_hamm(sub_path, out_file, effective_minsup_percent, keep_pattern_files)
-        else:
-            m = run_spmf(alg, sub_path, out_file, effective_minsup_percent, keep_pattern_files, spmf_filter_count)
-
+        m = runs[alg]
         recs.append({
             "algorithm": alg,
             "transaction_ratio_percent": float(r),
@@ -798,23 +1536,11 @@ def worker_txratio_point(ds, r, spmf_path, nbr_items, n_tx_full, ms_default, tx_
         })
 
     if "CICLAD" in baselines:
-        cached = _cache_lookup("CICLAD")
+        cached = cached_by_alg["CICLAD"]
         if cached is not None:
             recs.append(cached)
         else:
-            fci_file = os.path.join(ds_dir, f"CICLAD_tx{int(r)}_fci.txt")
-            log_file = os.path.join(ds_dir, f"CICLAD_tx{int(r)}.log")
-
-            m = run_ciclad_multi(
-                input_dat=sub_path,
-                fci_out_path=fci_file,
-                log_path=log_file,
-                nbr_items=nbr_items,
-                window_size=n_sub,
-                minsup_counts=[int(minsup_count_threshold)],
-                keep_pattern_files=keep_pattern_files,
-            )
-
+            m = runs["CICLAD"]
             count = int(m["dumped_fci_by_minsup"].get(int(minsup_count_threshold), 0))
             recs.append({
                 "algorithm": "CICLAD",
@@ -830,7 +1556,7 @@ def worker_txratio_point(ds, r, spmf_path, nbr_items, n_tx_full, ms_default, tx_
                 "runtime_sec": float(m["runtime_sec_wall"]),
                 "pattern_count": count,
                 "depth_proxy": 0,
-                "ciclad_log_path": os.path.basename(log_file),
+                "ciclad_log_path": os.path.basename(log_file) if keep_logs else None,
                 "cmd": m["cmd"],
                 "pattern_files_deleted": (not keep_pattern_files),
             })
@@ -838,7 +1564,7 @@ def worker_txratio_point(ds, r, spmf_path, nbr_items, n_tx_full, ms_default, tx_
     return ds, float(r), recs
 
 
-def worker_minsup_sweep(ds, spmf_path, dat_path, n_tx, nbr_items, minsup_ratios, baselines, ds_dir, resume, cache_ms, keep_pattern_files):
+def worker_minsup_sweep(ds, spmf_path, dat_path, n_tx, nbr_items, minsup_ratios, baselines, ds_dir, resume, cache_ms, keep_pattern_files, keep_logs=False, compress_patterns=False):
     """
     Run minsup sweep for one dataset:
       - SPMF runs per minsup%
@@ -847,23 +1573,28 @@ def worker_minsup_sweep(ds, spmf_path, dat_path, n_tx, nbr_items, minsup_ratios,
     """
     recs = []
 
+    # Loop invariants: the per-ratio algorithms and each algorithm's output path prefix.
+    point_algs = [a for a in baselines if a in {"FPGrowth_itemsets", "Eclat", "Hamm"}]
+    out_prefix = {alg: os.path.join(ds_dir, f"{alg}_ms") for alg in point_algs}
+
     for ms in minsup_ratios:
-        for alg in [a for a in baselines if a in {"FPGrowth_itemsets", "Eclat", "Hamm"}]:
-            key = (alg, float(ms), None)
+        ms_f = float(ms)
+        for alg in point_algs:
+            key = (alg, ms_f, None)
             if resume and key in cache_ms:
                 recs.append(cache_ms[key])
                 continue
 
-            out_file = os.path.join(ds_dir, f"{alg}_ms{ms}.spmf")
+            out_file = f"{out_prefix[alg]}{ms}.spmf"
             if alg == "Hamm":
                 m = run_hamm(spmf_path, out_file, ms, keep_pattern_files)
             else:
-                m = run_spmf(alg, spmf_path, out_file, ms, keep_pattern_files=keep_pattern_files)
+                m = run_spmf(alg, spmf_path, out_file, ms, keep_pattern_files=keep_pattern_files, compress_patterns=compress_patterns)
 
             recs.append({
                 "algorithm": alg,
                 "transaction_ratio_percent": 100.0,
-                "minsup_percent": float(ms),
+                "minsup_percent": ms_f,
                 "runtime_sec": float(m["runtime_sec"]),
                 "pattern_count": int(m["pattern_count"]),
                 "depth_proxy": int(m["max_itemset_len"]),
@@ -883,7 +1614,7 @@ def worker_minsup_sweep(ds, spmf_path, dat_path, n_tx, nbr_items, minsup_ratios,
                 if ("CICLAD", float(ms), int(ms_count)) not in cache_ms:
                     ok = False
                     break
-            if ok and os.path.exists(ciclad_log):
+            if ok:
                 need = False
 
         if need:
@@ -895,15 +1626,25 @@ def worker_minsup_sweep(ds, spmf_path, dat_path, n_tx, nbr_items, minsup_ratios,
                 window_size=n_tx,
                 minsup_counts=ciclad_counts,
                 keep_pattern_files=keep_pattern_files,
+                keep_log=keep_logs,
             )
             dumped_by = m["dumped_fci_by_minsup"]
             wall = float(m["runtime_sec_wall"])
             cmd = m["cmd"]
-        else:
+            log_name = os.path.basename(ciclad_log) if keep_logs else None
+        elif os.path.exists(ciclad_log):
             parsed = parse_ciclad_log(ciclad_log)
             dumped_by = parsed["dumped_fci_by_minsup"]
             wall = 0.0
             cmd = f"(skipped; see {os.path.basename(ciclad_log)})"
+            log_name = os.path.basename(ciclad_log)
+        else:
+            # No log was kept: the cached records already carry the counts.
+            dumped_by = {int(mc): int(cache_ms[("CICLAD", float(ms), int(mc))]["pattern_count"])
+                         for ms, mc in zip(minsup_ratios, ciclad_counts)}
+            wall = 0.0
+            cmd = "(skipped; cached)"
+            log_name = None
 
         for ms, ms_count in zip(minsup_ratios, ciclad_counts):
             recs.append({
@@ -914,7 +1655,7 @@ def worker_minsup_sweep(ds, spmf_path, dat_path, n_tx, nbr_items, minsup_ratios,
                 "runtime_sec": wall,
                 "pattern_count": int(dumped_by.get(int(ms_count), 0)),
                 "depth_proxy": 0,
-                "ciclad_log_path": os.path.basename(ciclad_log),
+                "ciclad_log_path": log_name,
                 "cmd": cmd,
                 "pattern_files_deleted": (not keep_pattern_files),
             })
@@ -942,12 +1683,27 @@ def main():
                         help="skip running points already present in metrics JSON and output files")
     parser.add_argument("--force-preprocess", action="store_true",
                         help="rebuild transactions even if results/<ds>_transactions.spmf exists")
-    parser.add_argument("--jobs", type=int, default=max(1, (os.cpu_count() or 4)//2),
-                        help="parallel workers (default: half of CPU cores)")
+    parser.add_argument("--jobs", type=int, default=max(1, available_cpus()//2),
+                        help="parallel workers and max concurrent tool subprocesses (default: half of CPU cores)")
     parser.add_argument("--keep-pattern-files", action="store_true",
                         help="keep frequent itemset/closed-itemset output files (default: delete after parsing)")
+    parser.add_argument("--compress-patterns", action="store_true",
+                        help="with --keep-pattern-files, store SPMF pattern outputs zstd-compressed as <file>.zst "
+                             "(needs the zstandard module or the zstd CLI)")
+    parser.add_argument("--spmf-server", action="store_true",
+                        help="run SPMF through persistent JVMs (tools/SpmfServer.java, needs javac) instead of one JVM per run; "
+                             "runtime_sec then excludes JVM start-up")
+    parser.add_argument("--keep-logs", action="store_true",
+                        help="also write CICLAD stderr logs to results/<ds>/CICLAD_*.log (default: parse the stream only)")
+    parser.add_argument("--concurrent-baselines", action="store_true",
+                        help="run the baselines of one tx-ratio point concurrently (faster, but their runtimes "
+                             "then compete for cores and memory bandwidth; default: sequential)")
+    parser.add_argument("--pin-cpus", action="store_true",
+                        help="bind each sweep worker (and the tools it starts) to a disjoint slice of the CPUs (Linux only)")
     args = parser.parse_args()
     print(f"[ok] Using JAVA_CMD for SPMF: {JAVA_CMD}")
+    if args.spmf_server and enable_spmf_server():
+        print(f"[ok] SPMF runs share persistent JVMs ({os.path.basename(SPMF_SERVER_SRC)})")
 
 
     datasets = [d.strip() for d in args.datasets.split(",") if d.strip()]
@@ -975,44 +1731,19 @@ def main():
     pathlib.Path(RESULTS_DIR).mkdir(parents=True, exist_ok=True)
 
     # 1) preprocess: build .spmf and .dat, compute nbr_items
-    prep = {}  # ds -> (spmf_path, dat_path, n_tx, nbr_items)
-    for ds in datasets:
-        print(f"[preprocess] {ds}")
-        spmf_path = os.path.join(RESULTS_DIR, f"{ds}_transactions.spmf")
-        dat_path  = os.path.join(RESULTS_DIR, f"{ds}_transactions.dat")
-        item2id_path = os.path.join(RESULTS_DIR, f"{ds}_item2id.json")
-        meta_path = os.path.join(RESULTS_DIR, f"{ds}_meta.json")
-
-        need = args.force_preprocess or (not os.path.exists(spmf_path)) or (not os.path.exists(dat_path)) or (not os.path.exists(item2id_path))
-        if need:
-            txs = LOADERS[ds]()
-            item2id = build_item2id_scan_order(txs)
-            write_transactions_int(txs, spmf_path, item2id)
-            shutil.copyfile(spmf_path, dat_path)  # CICLAD input is identical
-
-            n_tx = len(txs)
-            max_id = max(item2id.values()) if item2id else 0
-            nbr_items = max_id + 1
-
-            with open(item2id_path, "w", encoding="utf-8") as f:
-                json.dump(item2id, f, indent=2)
-
-            meta = {
-                "dataset": ds,
-                "n_transactions": n_tx,
-                "max_item_id": max_id,
-                "nbr_items_for_ciclad": nbr_items,
-                "format": "one transaction per line; space-separated positive ints; 1-based ids",
-                "id_assignment": "first-seen scan order over rows then columns (token=col=value)",
-                "label_included": True,
-            }
-            with open(meta_path, "w", encoding="utf-8") as f:
-                json.dump(meta, f, indent=2)
-        else:
-            n_tx, max_id = scan_max_id(spmf_path)
-            nbr_items = max_id + 1
+    # Datasets are independent (disjoint outputs), so they are preprocessed concurrently.
+    prep_workers = max(1, min(len(datasets), args.jobs))
+    if prep_workers > 1:
+        with ProcessPoolExecutor(max_workers=prep_workers, initializer=_init_preprocess_worker,
+                                 initargs=(max(1, available_cpus() // prep_workers),)) as ex:
+            metas = list(ex.map(preprocess_one, datasets, [args.force_preprocess] * len(datasets)))
+    else:
+        metas = [preprocess_one(ds, args.force_preprocess) for ds in datasets]
 
-        prep[ds] = (spmf_path, dat_path, n_tx, nbr_items)
+    prep = {}  # ds -> (spmf_path, dat_path, n_tx, nbr_items)
+    for ds, meta in zip(datasets, metas):
+        spmf_path, dat_path, _, _ = prep_paths(ds)
+        prep[ds] = (spmf_path, dat_path, int(meta["n_transactions"]), int(meta["nbr_items_for_ciclad"]))
 
     # 2) run experiments (parallel)
     metrics_by_ds = {}
@@ -1031,55 +1762,81 @@ def main():
         cache_tx_by_ds[ds] = c_tx
         cache_ms_by_ds[ds] = c_ms
 
+    # Run-wide settings, read once and shared by every task tuple below.
     keep_pattern_files = bool(args.keep_pattern_files)
+    resume = bool(args.resume)
+    tx_mode = str(args.tx_sweep_minsup_mode).lower()
+    keep_logs = bool(args.keep_logs)
+    compress_patterns = bool(args.compress_patterns)
+    concurrent_baselines = bool(args.concurrent_baselines)
+    slots = set_subprocess_slots(args.jobs)
+    # Sweep workers are processes so the Python glue around each run (subsampling,
+    # log parsing, record building) does not contend for one GIL.
+    # Index the full .spmf files once here; workers attach to the shared copies to subsample.
+    shared_idx = share_line_index(sorted({prep[ds][0] for ds in datasets}))
+    pin_cpus = None
+    if args.pin_cpus and hasattr(os, "sched_getaffinity"):
+        pin_cpus = (args.jobs, sorted(os.sched_getaffinity(0)))
+    pool_kwargs = dict(max_workers=args.jobs, initializer=_init_sweep_worker,
+                       initargs=(slots, USE_SPMF_SERVER, shared_idx, pin_cpus))
 
     # ----------------------
     # A) transaction ratio sweep (fixed minsup%) in parallel over (dataset, tx_ratio)
     # ----------------------
+    # Each task carries only the resume-cache entries for its own point (nothing without --resume),
+    # so the pickled task size does not grow with the dataset's metrics history.
     tx_tasks = []
     for ds in datasets:
         spmf_path, dat_path, n_tx, nbr_items = prep[ds]
         ds_dir = os.path.join(RESULTS_DIR, ds)
         ms_default = ms_map.get(ds, 1.0)
+        cache_slices = txratio_cache_slices(cache_tx_by_ds[ds]) if resume else {}
         for r in tx_ratios:
-            tx_tasks.append((ds, r, spmf_path, nbr_items, n_tx, ms_default, args.tx_sweep_minsup_mode, selected_baselines, ds_dir, args.resume, cache_tx_by_ds[ds], keep_pattern_files))
+            cache_tx = cache_slices.get((float(r), float(ms_default)), {})
+            tx_tasks.append((ds, r, spmf_path, nbr_items, n_tx, ms_default, tx_mode, selected_baselines, ds_dir, resume, cache_tx, keep_pattern_files, keep_logs, compress_patterns, concurrent_baselines))
 
     tx_results = {ds: {} for ds in datasets}  # ds -> r -> {alg: rec}
 
-    with ThreadPoolExecutor(max_workers=args.jobs) as ex:
+    # Write each dataset's metrics once, when its last point completes, not after every future
+    # (plus a checkpoint every METRICS_FLUSH_SEC for datasets with points still running).
+    inflight = Counter(t[0] for t in tx_tasks)
+    last_flush = {ds: time.monotonic() for ds in datasets}
+
+    with ProcessPoolExecutor(**pool_kwargs) as ex:
         futures = [ex.submit(worker_txratio_point, *t) for t in tx_tasks]
         for fut in as_completed(futures):
             ds, r, recs = fut.result()
+            inflight[ds] -= 1
 
             by_alg = {rec["algorithm"]: rec for rec in recs}
             tx_results[ds][r] = by_alg
 
             metrics = metrics_by_ds[ds]
+            cache_tx = cache_tx_by_ds[ds]
+            by_txratio = metrics.setdefault("by_txratio", [])
             for rec in recs:
-                if not find_cached(metrics.get("by_txratio", []),
-                                   algorithm=rec.get("algorithm"),
-                                   transaction_ratio_percent=float(rec.get("transaction_ratio_percent")),
-                                   minsup_percent=float(rec.get("minsup_percent")),
-                                   tx_sweep_minsup_mode=rec.get("tx_sweep_minsup_mode","percent"),
-                                   minsup_count_threshold=rec.get("minsup_count_threshold", None)):
-                    metrics.setdefault("by_txratio", []).append(rec)
-
-                try:
-                    cache_tx_by_ds[ds][(rec.get("algorithm"), float(rec.get("transaction_ratio_percent")), float(rec.get("minsup_percent")))] = rec
-                    cache_tx_by_ds[ds][(rec.get("algorithm"), float(rec.get("transaction_ratio_percent")), str(rec.get("tx_sweep_minsup_mode","percent")).lower(), float(rec.get("minsup_percent")), int(rec.get("minsup_count_threshold")) if rec.get("minsup_count_threshold", None) is not None else None)] = rec
-                except Exception:
-                    pass
-
-            ds_dir = os.path.join(RESULTS_DIR, ds)
-            with open(os.path.join(ds_dir, f"metrics_{ds}.json"), "w", encoding="utf-8") as f:
-                json.dump(metrics, f, indent=2)
+                # cache_tx indexes every by_txratio record already in metrics, so dedup is a
+                # dict lookup; the coerced key is computed once per record and reused.
+                key = txratio_key(rec)
+                if txratio_cached(cache_tx, key) is None:
+                    by_txratio.append(rec)
+                cache_tx[key] = rec
+
+            if inflight[ds] and time.monotonic() - last_flush[ds] < METRICS_FLUSH_SEC:
+                continue
+            save_metrics(os.path.join(RESULTS_DIR, ds), ds, metrics)
+            last_flush[ds] = time.monotonic()
 
     
+    # Plots render in the background (Agg is set at import, so workers inherit it) and overlap the minsup sweep.
+    plot_pool = ProcessPoolExecutor(max_workers=2)
+    plot_jobs = []
+
     # Plot tx-ratio per dataset
     for ds in datasets:
         ds_dir = os.path.join(RESULTS_DIR, ds)
         ms_default = ms_map.get(ds, 1.0)
-        mode = str(args.tx_sweep_minsup_mode).lower()
+        mode = tx_mode
     
         y_all = {alg: [] for alg in selected_baselines}
         for r in tx_ratios:
@@ -1094,10 +1851,11 @@ def main():
             subtitle = f"fixed minsup = {ms_default}%"
             out_png = os.path.join(ds_dir, f"txratio_runtime_{ds}_percent.png")
     
-        plot_multi(tx_ratios, y_all,
-                   f"{ds} — runtime vs. transaction ratio ({subtitle})",
-                   "transaction ratio (%)", "runtime (s)",
-                   out_png)
+        plot_jobs.append(plot_pool.submit(
+            plot_multi, tx_ratios, y_all,
+            f"{ds} — runtime vs. transaction ratio ({subtitle})",
+            "transaction ratio (%)", "runtime (s)",
+            out_png))
     
     # ----------------------
     # B) minsup ratio sweep (full dataset) in parallel over dataset
@@ -1106,42 +1864,37 @@ def main():
     for ds in datasets:
         spmf_path, dat_path, n_tx, nbr_items = prep[ds]
         ds_dir = os.path.join(RESULTS_DIR, ds)
-        ms_tasks.append((ds, spmf_path, dat_path, n_tx, nbr_items, minsup_ratios, selected_baselines, ds_dir, args.resume, cache_ms_by_ds[ds], keep_pattern_files))
+        wanted_ms = {float(ms) for ms in minsup_ratios}
+        cache_ms = {k: v for k, v in cache_ms_by_ds[ds].items()
+                    if k[0] in selected_baselines and k[1] in wanted_ms} if resume else {}
+        ms_tasks.append((ds, spmf_path, dat_path, n_tx, nbr_items, minsup_ratios, selected_baselines, ds_dir, resume, cache_ms, keep_pattern_files, keep_logs, compress_patterns))
 
     ms_results = {ds: {} for ds in datasets}  # ds -> (alg, ms) -> rec
 
-    with ThreadPoolExecutor(max_workers=args.jobs) as ex:
+    with ProcessPoolExecutor(**pool_kwargs) as ex:
         futures = [ex.submit(worker_minsup_sweep, *t) for t in ms_tasks]
         for fut in as_completed(futures):
             ds, recs = fut.result()
 
             idx = {}
-            for rec in recs:
-                idx[(rec["algorithm"], float(rec["minsup_percent"]))] = rec
-            ms_results[ds] = idx
-
             metrics = metrics_by_ds[ds]
+            cache_ms = cache_ms_by_ds[ds]
+            by_minsup = metrics.setdefault("by_minsup", [])
             for rec in recs:
                 alg = rec.get("algorithm")
                 ms = float(rec.get("minsup_percent"))
                 mc = rec.get("minsup_count", None)
                 mc = int(mc) if mc is not None else None
+                idx[(alg, ms)] = rec
 
-                if not find_cached(metrics.get("by_minsup", []),
-                                   algorithm=alg,
-                                   transaction_ratio_percent=100.0,
-                                   minsup_percent=ms,
-                                   minsup_count=mc if mc is not None else None):
-                    metrics.setdefault("by_minsup", []).append(rec)
-
-                try:
-                    cache_ms_by_ds[ds][(alg, ms, mc)] = rec
-                except Exception:
-                    pass
+                # cache_ms indexes every by_minsup record already in metrics.
+                key = (alg, ms, mc)
+                if key not in cache_ms:
+                    by_minsup.append(rec)
+                cache_ms[key] = rec
+            ms_results[ds] = idx
 
-            ds_dir = os.path.join(RESULTS_DIR, ds)
-            with open(os.path.join(ds_dir, f"metrics_{ds}.json"), "w", encoding="utf-8") as f:
-                json.dump(metrics, f, indent=2)
+            save_metrics(os.path.join(RESULTS_DIR, ds), ds, metrics)
 
     # Plot minsup per dataset
     for ds in datasets:
@@ -1154,10 +1907,15 @@ def main():
                 rec = idx.get((alg, float(ms)))
                 y_all[alg].append(float(rec["runtime_sec"]) if rec else float("nan"))
 
-        plot_multi(minsup_ratios, y_all,
-                   f"{ds} — runtime vs. minsup",
-                   "minsup (%)", "runtime (s)",
-                   os.path.join(ds_dir, f"minsup_runtime_{ds}.png"))
+        plot_jobs.append(plot_pool.submit(
+            plot_multi, minsup_ratios, y_all,
+            f"{ds} — runtime vs. minsup",
+            "minsup (%)", "runtime (s)",
+            os.path.join(ds_dir, f"minsup_runtime_{ds}.png")))
+
+    for fut in plot_jobs:
+        fut.result()  # surface plotting errors
+    plot_pool.shutdown()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -43,7 +43,11 @@ pip freeze > requirements.txt
 
 echo -e "${GREEN}[4/4] Compiling C++ Project...${NC}"
 if [ -f "src/Hamm.cpp" ]; then
-    g++ -O3 -o tools/hamm src/Hamm.cpp
+    # Same flags as run_batch_verify.py; ccache is used when installed.
+    CXX="g++"
+    command -v ccache &> /dev/null && CXX="ccache g++"
+    $CXX -O3 -march=native -mtune=native -flto=auto -funroll-loops -fno-plt -DNDEBUG -pipe -o tools/hamm src/Hamm.cpp \
+        || $CXX -O3 -o tools/hamm src/Hamm.cpp
     if [ $? -eq 0 ]; then
         echo -e "${GREEN}✅ Environment Setup Complete!${NC}"
         echo "To activate environment manually, run: source .venv/bin/activate"
@@ -2,11 +2,11 @@
 #include <fstream>
 #include <string>
 #include <vector>
-#include <sstream>
 #include <algorithm>
-#include <map>
 #include <iomanip>
 #include <cmath>
+#include <cstdlib>
+#include <cstring>
 #include <chrono>
 
 #ifdef _WIN32
@@ -16,14 +16,12 @@
 #include <unistd.h>
 #include <sys/resource.h>
 #endif
+#include <sys/stat.h>
 
 using namespace std;
 
 int max_id_found = 0;
 
-map<string, int> str_to_id;
-vector<string> id_to_str;
-
 struct Node {
     int item = -1;
     int freq = 0;
@@ -77,7 +75,7 @@ void remove_infrequent_items(vector<Header*>& itemList, int min_sup) {
 }
 
 void write_output(vector<int> pattern, int support, ofstream& outfile, int total_transactions) {
-    sort(pattern.begin(), pattern.end());
+    sort(pattern.begin(), pattern.end());  // ascending ids, like SPMF: verify.py compares raw lines first
     for (size_t i = 0; i < pattern.size(); i++) {
         outfile << pattern[i] << (i != pattern.size() - 1 ? " " : "");
     }
@@ -222,42 +220,89 @@ void FP_Growth(Node* root, vector<Header*>& headers, vector<int> prefix, int min
     }
 }
 
+// Append one transaction line (NUL-terminated) to the CSR store and count its items.
+void read_transaction_line(const char* p, vector<int>& tx_items, vector<size_t>& tx_offsets, vector<int>& item_counts) {
+    // Parse ids with strtol (no stringstream per line); stops at the first non-number, like >>.
+    char* end;
+    for(long v = strtol(p, &end, 10); end != p; v = strtol(p, &end, 10)) {
+        p = end;
+        int item_id = (int)v;
+        tx_items.push_back(item_id);
+        if(item_id >= (int)item_counts.size()) item_counts.resize(item_id + 1, 0);
+        item_counts[item_id]++;
+        if(item_id > max_id_found) max_id_found = item_id;
+    }
+    tx_offsets.push_back(tx_items.size());
+}
+
 int main(int argc , char* argv[]) {
     std::ios::sync_with_stdio(false);
     std::cin.tie(NULL);
     if (argc < 4) return 1;
-    float min_sup_rate = stof(argv[1]);
+    double min_sup_rate = stod(argv[1]);
     string input_file = argv[2];
     string output_file = argv[3];
     
-    ifstream infile(input_file);
-    if(!infile.is_open()) return 1;
+    struct stat input_stat;
+    if(stat(input_file.c_str(), &input_stat) != 0 || (input_stat.st_mode & S_IFMT) == S_IFDIR) {
+        cerr << "Cannot read input file: " << input_file << "\n";
+        return 1;
+    }
+    ifstream infile(input_file, ios::binary);
+    if(!infile.is_open()) {
+        cerr << "Cannot open input file: " << input_file << "\n";
+        return 1;
+    }
 
-    vector<vector<int>> transactions;
-    map<int, int> temp_counts;
-    string line;
+    // CSR store: transaction t is tx_items[tx_offsets[t] .. tx_offsets[t+1]) (no vector per transaction).
+    vector<int> tx_items;
+    vector<size_t> tx_offsets(1, 0);
+    vector<int> item_counts;  // indexed by item id: one array access per token instead of a map lookup
 
     auto start_time = std::chrono::high_resolution_clock::now();
-    while(getline(infile, line)){
-        if(line.empty()) continue;
-        stringstream ss(line);
-        int item_id;
-        vector<int> transaction;
-        while(ss >> item_id) {
-            transaction.push_back(item_id);
-            temp_counts[item_id]++;
-            if(item_id > max_id_found) max_id_found = item_id;
+    streamoff file_size = -1;
+    if((input_stat.st_mode & S_IFMT) == S_IFREG) {
+        infile.seekg(0, ios::end);
+        file_size = infile.tellg();
+        infile.seekg(0, ios::beg);
+    }
+    if(file_size >= 0) {
+        // Regular file: one bulk read, then lines are parsed in place (no getline copy per line).
+        string data((size_t)file_size, '\0');
+        infile.read(&data[0], file_size);
+
+        char* p = &data[0];
+        char* data_end = p + data.size();
+        while(p < data_end){
+            char* eol = (char*)memchr(p, '\n', data_end - p);
+            if(eol == nullptr) eol = data_end;
+            if(eol != p) {
+                *eol = '\0';  // bound strtol to this line (data_end already points at the string's terminator)
+                read_transaction_line(p, tx_items, tx_offsets, item_counts);
+            }
+            p = eol + 1;
+        }
+    }
+    else {
+        // FIFO, pipe or other non-seekable input: stream it line by line.
+        infile.clear();
+        string line;
+        while(getline(infile, line)){
+            if(line.empty()) continue;
+            read_transaction_line(line.c_str(), tx_items, tx_offsets, item_counts);
         }
-        transactions.push_back(transaction);
     }
     infile.close();
 
-    int min_sup = (int)ceil(min_sup_rate * transactions.size());
+    size_t total_transactions = tx_offsets.size() - 1;
+    // Integer count threshold, computed in double like SPMF's ceil(minsup * n); all support tests below are int compares.
+    int min_sup = (int)ceil(min_sup_rate * (double)total_transactions);
 
     vector<Header*> headers;
     vector<Header*> header_map(max_id_found + 1, nullptr);
-    for(auto const& [id, freq] : temp_counts) {
-        if(freq >= min_sup) {
+    for(int id = 0; id < (int)item_counts.size(); id++) {
+        int freq = item_counts[id];
+        if(freq > 0 && freq >= min_sup) {
             Header* h = new Header();
             h->item = id;
             h->freq = freq;
@@ -274,9 +319,10 @@ int main(int argc , char* argv[]) {
     remove_infrequent_items(headers, min_sup);
 
     vector<pair<vector<int>, int>> initialPaths;
-    for(auto& trans : transactions) {
+    for(size_t t = 0; t < total_transactions; t++) {
         vector<int> filtered_path;
-        for(int id : trans) {
+        for(size_t k = tx_offsets[t]; k < tx_offsets[t + 1]; k++) {
+            int id = tx_items[k];
             if(header_map[id]) filtered_path.push_back(id);
         }
         if(!filtered_path.empty()) initialPaths.push_back({filtered_path, 1});
@@ -287,7 +333,7 @@ int main(int argc , char* argv[]) {
     ofstream outfile(output_file);
     if (!outfile.is_open()) return 1;
 
-    FP_Growth(root, headers, {}, min_sup, outfile, transactions.size(), max_id_found);
+    FP_Growth(root, headers, {}, min_sup, outfile, total_transactions, max_id_found);
 
     outfile.close();
 
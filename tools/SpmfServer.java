@@ -0,0 +1,48 @@
+import java.io.BufferedReader;
+import java.io.FileDescriptor;
+import java.io.FileOutputStream;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import java.nio.charset.StandardCharsets;
+import java.util.Arrays;
+
+import ca.pfv.spmf.gui.CommandProcessor;
+
+/**
+ * Persistent SPMF runner used by experiment.py (--spmf-server).
+ *
+ * Keeps one JVM alive and runs SPMF algorithms on request, so JVM start-up and
+ * JIT warm-up are paid once instead of once per run.
+ *
+ * Protocol (one tab-separated request per line on stdin):
+ *   run  ALGORITHM  INPUT  OUTPUT  PARAM...   ->  "OK"  or  "ERR<TAB>message"
+ *   quit                                       ->  exits
+ *
+ * SPMF's own console output is redirected to stderr so it never mixes with replies.
+ */
+public class SpmfServer {
+    public static void main(String[] args) throws Exception {
+        PrintStream reply = new PrintStream(new FileOutputStream(FileDescriptor.out), true, "UTF-8");
+        System.setOut(System.err);
+
+        BufferedReader in = new BufferedReader(new InputStreamReader(System.in, StandardCharsets.UTF_8));
+        String line;
+        while ((line = in.readLine()) != null) {
+            String[] parts = line.split("\t");
+            if (parts.length == 0 || parts[0].equals("quit")) {
+                break;
+            }
+            if (!parts[0].equals("run") || parts.length < 4) {
+                reply.println("ERR\tmalformed request: " + line);
+                continue;
+            }
+            try {
+                new CommandProcessor().runAlgorithm(parts[1], parts[2], parts[3],
+                        Arrays.copyOfRange(parts, 4, parts.length));
+                reply.println("OK");
+            } catch (Throwable t) {
+                reply.println("ERR\t" + String.valueOf(t).replace('\n', ' ').replace('\t', ' '));
+            }
+        }
+    }
+}
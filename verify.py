@@ -1,24 +1,118 @@
+import os
 import sys
+import mmap
+import hashlib
 
-def load_patterns(filepath):
-    patterns = set()
+import numpy as np
+
+_M1 = np.uint64(0xBF58476D1CE4E5B9)
+_M2 = np.uint64(0x94D049BB133111EB)
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+def _mix64(x):
+    """splitmix64 finalizer over a uint64 array (wrapping arithmetic)."""
+    x = x ^ (x >> np.uint64(30))
+    x = x * _M1
+    x = x ^ (x >> np.uint64(27))
+    x = x * _M2
+    return x ^ (x >> np.uint64(31))
+
+def read_pattern_lines(filepath):
+    """Raw bytes of every #SUP: line in filepath (read only on a cache miss)."""
+    try:
+        with open(filepath, 'rb') as f:
+            return [line for line in f.read().splitlines() if b"#SUP:" in line]
+    except FileNotFoundError:
+        print(f"Error: File {filepath} not found.")
+        sys.exit(1)
+
+# Pairs already verified as matching: one small file per pair under this directory, holding the
+# pattern count. Separate files keep concurrent verify runs (run_batch_verify) from losing entries.
+VERIFY_CACHE = os.environ.get("VERIFY_CACHE", os.path.join("results", ".verify_cache"))
+
+def _verifier_digest():
+    """Digest of this script: any change to the verifier invalidates earlier cached results."""
+    with open(os.path.abspath(__file__), 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=8).hexdigest()
+
+def file_digest(filepath):
+    """blake2b digest of filepath, hashed straight from a memory map (the bytes are not copied)."""
     try:
-        with open(filepath, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if not line or "#SUP:" not in line:
-                    continue
-                
-                parts = line.split("#SUP:")
-                items_str = parts[0].strip()
-                support = int(parts[1].strip())
-                
-                items = tuple(sorted([int(x) for x in items_str.split()]))
-                patterns.add((items, support))
+        with open(filepath, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return hashlib.blake2b(b"", digest_size=16).hexdigest()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return hashlib.blake2b(mm, digest_size=16).hexdigest()
     except FileNotFoundError:
         print(f"Error: File {filepath} not found.")
         sys.exit(1)
-    return patterns
+
+def verify_cache_path(digest_a, digest_b):
+    """
+    Cache entry of a file pair (order-independent), keyed by the verifier version too.
+    Identical files map to a self-pair entry. Entries hold the unique pattern count.
+    """
+    return os.path.join(VERIFY_CACHE, "-".join([_verifier_digest()] + sorted((digest_a, digest_b))))
+
+def load_verify_cache(path):
+    """Cached pattern count of a matching pair, or None."""
+    try:
+        with open(path, 'r') as f:
+            return int(f.read())
+    except (OSError, ValueError):
+        return None
+
+def save_verify_cache(path, count):
+    os.makedirs(VERIFY_CACHE, exist_ok=True)
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, 'w') as f:
+        f.write(str(count))
+    os.replace(tmp, path)
+
+def raw_line_fingerprints(lines):
+    """
+    One 64-bit hash per raw line, no parsing. Hamm and SPMF both write items in ascending
+    order with the same "a b c #SUP: n" layout, so equal patterns are byte-identical lines.
+    """
+    return np.fromiter(map(hash, lines), dtype=np.int64, count=len(lines)).view(np.uint64)
+
+def fingerprint_rows(lines):
+    """
+    One uint64 fingerprint per #SUP: line, matching pattern sets as (items, support)
+    regardless of item order or spacing.
+
+    All numbers are parsed in one np.fromstring call, and each row hashes to the wrapping
+    sum of its mixed item ids (order-independent, so no per-row sort) mixed with the support.
+    """
+    if not lines:
+        return np.zeros(0, dtype=np.uint64)
+
+    # "items #SUP: sup" -> "items -1 sup": the value after each -1 is that row's support.
+    vals = np.fromstring(b"\n".join(lines).replace(b"#SUP:", b" -1 "), dtype=np.int64, sep=" ")
+    marker = np.flatnonzero(vals < 0)
+    sups = vals[marker + 1]
+
+    is_item = np.ones(len(vals), dtype=bool)
+    is_item[marker] = False
+    is_item[marker + 1] = False
+    h = np.where(is_item, _mix64(vals.astype(np.uint64) + _GOLDEN), np.uint64(0))
+    row_sums = np.diff(np.cumsum(h, dtype=np.uint64)[marker], prepend=np.uint64(0))
+    return _mix64(row_sums ^ _mix64(sups.astype(np.uint64)))
+
+def unique_sorted(fp):
+    """Sorted fingerprints with duplicates dropped (set semantics)."""
+    fp = np.sort(fp)
+    keep = np.ones(len(fp), dtype=bool)
+    keep[1:] = fp[1:] != fp[:-1]
+    return fp[keep]
+
+def sample_patterns(lines, fp, wanted, limit=5):
+    """Decode up to limit patterns whose fingerprint is in wanted (sorted), for diagnostics."""
+    out = []
+    for i in np.flatnonzero(np.isin(fp, wanted))[:limit]:
+        items_str, _, sup_str = lines[i].partition(b"#SUP:")
+        out.append((tuple(sorted(int(x) for x in items_str.split())), int(sup_str)))
+    return out
 
 if __name__ == "__main__":
     if len(sys.argv) < 3:
@@ -30,21 +124,51 @@ if __name__ == "__main__":
 
     print(f"Comparing:\n  [H] {file_h}\n  [S] {file_s}\n")
 
-    set_h = load_patterns(file_h)
-    set_s = load_patterns(file_s)
+    # Hash first and consult the cache; lines are only read and split on a miss.
+    digest_h = file_digest(file_h)
+    digest_s = file_digest(file_s)
+    cache_path = verify_cache_path(digest_h, digest_s)
+    cached_count = load_verify_cache(cache_path)
+    if cached_count is not None:
+        print("✅ [SUCCESS] 100% Match! Hamm results are correct. (cached)")
+        print(f"Total patterns found: {cached_count}")
+        sys.exit(0)
 
-    if set_h == set_s:
+    if digest_h == digest_s:
+        # Same bytes: nothing to compare, only the pattern count of one file is needed.
+        count = int(len(unique_sorted(raw_line_fingerprints(read_pattern_lines(file_h)))))
         print("✅ [SUCCESS] 100% Match! Hamm results are correct.")
-        print(f"Total patterns found: {len(set_h)}")
+        print(f"Total patterns found: {count}")
+        save_verify_cache(cache_path, count)
+        sys.exit(0)
+
+    lines_h = read_pattern_lines(file_h)
+    lines_s = read_pattern_lines(file_s)
+
+    # Fast path for the sorted-output contract: identical sets of raw lines => identical patterns.
+    # Anything else (other item order or spacing, or a real mismatch) takes the parsing path.
+    fp_h = unique_sorted(raw_line_fingerprints(lines_h))
+    fp_s = unique_sorted(raw_line_fingerprints(lines_s))
+    if not np.array_equal(fp_h, fp_s):
+        rows_h = fingerprint_rows(lines_h)
+        rows_s = fingerprint_rows(lines_s)
+        fp_h = unique_sorted(rows_h)
+        fp_s = unique_sorted(rows_s)
+
+    if np.array_equal(fp_h, fp_s):
+        print("✅ [SUCCESS] 100% Match! Hamm results are correct.")
+        print(f"Total patterns found: {len(fp_h)}")
+        save_verify_cache(cache_path, int(len(fp_h)))
     else:
         print("❌ [FAILURE] Mismatch detected!")
-        print(f"Hamm count: {len(set_h)}")
-        print(f"SPMF count: {len(set_s)}")
-        
-        only_h = set_h - set_s
-        only_s = set_s - set_h
-        
-        if only_h:
-            print(f"\nItems only in Hamm (Potential False Positives): {list(only_h)[:5]} ...")
-        if only_s:
-            print(f"\nItems missing in Hamm (Potential False Negatives): {list(only_s)[:5]} ...")
\ No newline at end of file
+        print(f"Hamm count: {len(fp_h)}")
+        print(f"SPMF count: {len(fp_s)}")
+
+        # Set differences on the fingerprint arrays; only the differing lines are decoded to tuples.
+        only_h = np.setdiff1d(fp_h, fp_s, assume_unique=True)
+        only_s = np.setdiff1d(fp_s, fp_h, assume_unique=True)
+
+        if len(only_h):
+            print(f"\nItems only in Hamm (Potential False Positives): {sample_patterns(lines_h, rows_h, only_h)} ...")
+        if len(only_s):
+            print(f"\nItems missing in Hamm (Potential False Negatives): {sample_patterns(lines_s, rows_s, only_s)} ...")